@@ -1065,12 +1065,13 @@ else:
             load_model1_results = water_stress.load_model1_results
             load_model2_results = water_stress.load_model2_results
             load_model3_results = water_stress.load_model3_results
-            make_water_stress_map = water_stress.make_water_stress_map
-            make_urban_water_stress_map = water_stress.make_urban_water_stress_map
-            make_ecosystem_resilience_map = water_stress.make_ecosystem_resilience_map
-            _compute_automated_insights = water_stress._compute_automated_insights
-            _compute_urban_insights = water_stress._compute_urban_insights
-            _compute_ecosystem_insights = water_stress._compute_ecosystem_insights
+            _cached_water_stress_map = water_stress._cached_water_stress_map
+            _cached_urban_map = water_stress._cached_urban_map
+            _cached_ecosystem_map = water_stress._cached_ecosystem_map
+            _file_mtime = water_stress._file_mtime
+            _cached_automated_insights = water_stress._cached_automated_insights
+            _cached_urban_insights = water_stress._cached_urban_insights
+            _cached_ecosystem_insights = water_stress._cached_ecosystem_insights
             
             WATER_STRESS_AVAILABLE = True
         else:
@@ -1099,6 +1100,8 @@ else:
                 "model3_ecosystem_resilience.geojson"
             )
         )
+        # Dosya değişince önbellekler yenilensin diye değişiklik zamanı anahtara eklenir
+        geojson_mtime = _file_mtime(geojson_path_str)
         
         if selected_model == 1:
             st.markdown('<div style="margin-bottom: 1.5rem;"></div>', unsafe_allow_html=True)
@@ -1106,7 +1109,7 @@ else:
             st.markdown("Tarımsal bölgeler için su stresi skorunu hesaplar.")
             
             try:
-                gdf = load_model1_results(geojson_path_str)
+                gdf = load_model1_results(geojson_path_str, mtime=geojson_mtime)
                 if not gdf.empty:
                     score_col = "final_water_stress_score"
                     if score_col in gdf.columns:
@@ -1115,7 +1118,7 @@ else:
                         
                         with map_col:
                             st.markdown("#### Su Stresi Haritası")
-                            m = make_water_stress_map(gdf)
+                            m = _cached_water_stress_map(geojson_path_str, geojson_mtime)
                             st_folium(m, width="100%", height=600)
                         
                         with table_col:
@@ -1129,7 +1132,9 @@ else:
                         # Otomatik içgörüler
                         st.markdown("---")
                         st.markdown("#### Otomatik İçgörüler")
-                        insights = _compute_automated_insights(gdf, score_col=score_col)
+                        insights = _cached_automated_insights(
+                            geojson_path_str, geojson_mtime, score_col=score_col
+                        )
                         
                         col1, col2, col3 = st.columns(3)
                         with col1:
@@ -1184,7 +1189,7 @@ else:
             st.markdown("Şehir düzeyinde su stresi analizi.")
             
             try:
-                gdf = load_model2_results(geojson_path_str)
+                gdf = load_model2_results(geojson_path_str, mtime=geojson_mtime)
                 if not gdf.empty:
                     score_col = "urban_water_stress_score"
                     if score_col in gdf.columns:
@@ -1196,7 +1201,7 @@ else:
                             st.markdown("#### Kentsel Su Stresi Haritası")
                             try:
                                 if not gdf.empty and gdf.geometry.notna().any():
-                                    m = make_urban_water_stress_map(gdf)
+                                    m = _cached_urban_map(geojson_path_str, geojson_mtime)
                                     st_folium(m, width="100%", height=600)
                                 else:
                                     st.warning("Harita için geçerli geometri verisi bulunamadı.")
@@ -1260,8 +1265,10 @@ else:
                         
                         st.markdown("---")
                         st.markdown("#### Otomatik Kentsel İçgörüler")
-                        if _compute_urban_insights:
-                            insights = _compute_urban_insights(gdf, score_col=score_col)
+                        if _cached_urban_insights:
+                            insights = _cached_urban_insights(
+                                geojson_path_str, geojson_mtime, score_col=score_col
+                            )
                             col1, col2, col3 = st.columns(3)
                             with col1:
                                 render_metric_card("🔴", "Yüksek Risk", f"{insights['high_risk_share_pct']:.1f}%", "En üst %20", color="danger")
@@ -1297,7 +1304,7 @@ else:
             st.markdown("Korunan alanlar için su kırılganlığı analizi.")
             
             try:
-                gdf = load_model3_results(geojson_path_str)
+                gdf = load_model3_results(geojson_path_str, mtime=geojson_mtime)
                 if not gdf.empty:
                     score_col = "ecosystem_water_sensitivity_score"
                     if score_col in gdf.columns:
@@ -1306,7 +1313,7 @@ else:
                             st.markdown("#### Ekosistem Su Hassasiyeti Haritası")
                             try:
                                 if not gdf.empty and gdf.geometry.notna().any():
-                                    m = make_ecosystem_resilience_map(gdf)
+                                    m = _cached_ecosystem_map(geojson_path_str, geojson_mtime)
                                     st_folium(m, width="100%", height=600)
                                 else:
                                     st.warning("Harita için geçerli geometri verisi bulunamadı.")
@@ -1366,8 +1373,10 @@ else:
                         # Otomatik içgörüler
                         st.markdown("---")
                         st.markdown("#### Otomatik Ekosistem İçgörüleri")
-                        if _compute_ecosystem_insights:
-                            insights = _compute_ecosystem_insights(gdf, score_col=score_col)
+                        if _cached_ecosystem_insights:
+                            insights = _cached_ecosystem_insights(
+                                geojson_path_str, geojson_mtime, score_col=score_col
+                            )
                             col1, col2, col3 = st.columns(3)
                             with col1:
                                 render_metric_card("🔴", "Yüksek Hassasiyet", f"{insights['high_risk_share_pct']:.1f}%", "En üst %20", color="danger")
@@ -1,13 +1,18 @@
+import hashlib
+import importlib.util
+import json
+import re
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+import shapely
 import streamlit as st
+import streamlit.components.v1 as components
 import folium
 from branca.colormap import LinearColormap
-from streamlit_folium import st_folium
 
 
 st.set_page_config(
@@ -16,279 +21,493 @@ st.set_page_config(
 )
 
 
+# Attribute columns read by the Model 1 tab (map, top-10 table, decomposition)
+_MODEL1_COLUMNS = (
+    "final_water_stress_score",
+    "drought_norm",
+    "groundwater_norm",
+    "agricultural_area_pressure",
+)
+
+
+# Read through pyogrio when available, batch-decoding features over GDAL's Arrow
+# stream if pyarrow is installed too; otherwise geopandas picks its default engine.
+_READ_ENGINE_KWARGS: Dict[str, object] = {}
+if importlib.util.find_spec("pyogrio") is not None:
+    _READ_ENGINE_KWARGS["engine"] = "pyogrio"
+    if importlib.util.find_spec("pyarrow") is not None:
+        _READ_ENGINE_KWARGS["use_arrow"] = True
+
+
+def _is_up_to_date(candidate: Path, source: Path) -> bool:
+    """Whether `candidate` exists and was written no earlier than `source`."""
+    try:
+        return candidate.stat().st_mtime_ns >= source.stat().st_mtime_ns
+    except OSError:
+        return False
+
+
+def _project_columns(
+    gdf: gpd.GeoDataFrame, columns: Optional[Tuple[str, ...]]
+) -> gpd.GeoDataFrame:
+    """Keep only `columns` (plus the geometry) of `gdf`; None keeps everything."""
+    if columns is None:
+        return gdf
+    return gdf[[c for c in gdf.columns if c in columns or c == gdf.geometry.name]]
+
+
+def _read_geojson(
+    path: Path,
+    columns: Optional[Tuple[str, ...]] = None,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+) -> gpd.GeoDataFrame:
+    """
+    Read a GeoJSON output, pushing optional column and bounding-box filters down to
+    the OGR driver so unused attributes and features are never parsed.
+
+    If the pipeline also wrote a GeoParquet twin (same name, `.parquet`) that is at
+    least as new, that is read instead and the JSON parse is skipped entirely.
+    """
+    twin_path = path.with_suffix(".parquet")
+    if bbox is None and _is_up_to_date(twin_path, path):
+        try:
+            return _project_columns(gpd.read_parquet(twin_path), columns)
+        except (ImportError, OSError, ValueError):
+            pass  # fall back to the GeoJSON
+
+    read_kwargs = dict(_READ_ENGINE_KWARGS)
+    if columns is not None:
+        read_kwargs["columns"] = list(columns)
+    if bbox is not None:
+        read_kwargs["bbox"] = bbox
+    return gpd.read_file(path, **read_kwargs)
+
+
+# Sidecars are named <stem>.<source mtime_ns>.<tag>.<loader>.<column selection>.parquet.
+# The loader ("model1".."model3") keeps one model's cleaned layer from being read back by
+# another loader pointed at the same file. The tag is bumped whenever the loaders'
+# cleaning changes, so sidecars written by older code are never read; the helper module
+# cleans layers differently and uses its own tag.
+_SIDECAR_TAG = "dashboard3"
+# The loader part is optional so older, loader-less sidecars are still recognised and cleaned up
+_SIDECAR_SUFFIX_RE = r"\.(\d+)\.([a-z]+)(\d+)(?:\.model\d)?\.(all|[0-9a-f]{12})\.parquet"
+
+
+def _parquet_cache_path(
+    path: Path, loader: str, columns: Optional[Tuple[str, ...]] = None
+) -> Path:
+    """
+    Parquet sidecar of a GeoJSON output as cleaned by `loader`, for one column selection
+    (None for all columns).
+    """
+    if columns is None:
+        selection = "all"
+    else:
+        selection = hashlib.blake2b(
+            "\0".join(sorted(columns)).encode(), digest_size=6
+        ).hexdigest()
+    return path.with_name(
+        f"{path.stem}.{path.stat().st_mtime_ns}.{_SIDECAR_TAG}.{loader}.{selection}.parquet"
+    )
+
+
+def _read_parquet_cache(
+    path: Path,
+    loader: str,
+    columns: Optional[Tuple[str, ...]] = None,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+) -> Optional[gpd.GeoDataFrame]:
+    """
+    Return the cleaned layer from its up-to-date Parquet sidecar, or None if there is
+    none. A column selection without a sidecar of its own is projected from the full
+    layer's sidecar. Bounding-box reads always go to the GeoJSON, since `bbox` is in the
+    source CRS.
+    """
+    if bbox is not None:
+        return None
+    candidates = [_parquet_cache_path(path, loader, columns)]
+    if columns is not None:
+        candidates.append(_parquet_cache_path(path, loader))
+    for cache_path in candidates:
+        if not cache_path.exists():
+            continue
+        try:
+            return _project_columns(gpd.read_parquet(cache_path), columns)
+        except (ImportError, OSError, ValueError):
+            return None
+    return None
+
+
+def _write_parquet_cache(
+    path: Path,
+    loader: str,
+    gdf: gpd.GeoDataFrame,
+    columns: Optional[Tuple[str, ...]] = None,
+) -> None:
+    """Best-effort write of the Parquet sidecar (needs pyarrow and write access)."""
+    cache_path = _parquet_cache_path(path, loader, columns)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    mtime_ns = str(path.stat().st_mtime_ns)
+    tag_name = _SIDECAR_TAG.rstrip("0123456789")
+    try:
+        gdf.to_parquet(tmp_path)
+        tmp_path.replace(cache_path)
+        # Drop our sidecars of earlier versions of the source file, or of an older tag.
+        # Names are matched exactly, so unrelated files sharing the stem are left alone.
+        sidecar_re = re.compile(re.escape(path.stem) + _SIDECAR_SUFFIX_RE)
+        for entry in path.parent.iterdir():
+            match = sidecar_re.fullmatch(entry.name)
+            if match is None:
+                continue
+            source_mtime, name, version = match.group(1, 2, 3)
+            if source_mtime != mtime_ns or (name == tag_name and name + version != _SIDECAR_TAG):
+                entry.unlink()
+    except (ImportError, OSError, ValueError):
+        pass
+
+
+def _file_mtime(geojson_path: str) -> Optional[float]:
+    """Modification time of a layer file, or None if it is missing (the loader reports that)."""
+    try:
+        return Path(geojson_path).stat().st_mtime
+    except OSError:
+        return None
+
+
+def _stringify_datetime_columns(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """
+    Cast datetime columns to strings so the layer serializes to GeoJSON.
+
+    Native datetime columns (naive or tz-aware, both of dtype kind "M") are found in
+    one sweep over the dtypes; object columns are judged by their first non-null
+    value instead of a scan over every row. Returns a new frame that shares the
+    untouched columns, so callers need no defensive copy.
+    """
+    dt_cols = []
+    for col, dtype in gdf.dtypes.items():
+        if dtype.kind == "M":
+            dt_cols.append(col)
+        elif dtype == object:
+            notna = gdf[col].notna().to_numpy()
+            if notna.any():
+                first_val = gdf[col].iat[int(notna.argmax())]
+                if isinstance(first_val, pd.Timestamp) or "timestamp" in str(type(first_val)).lower():
+                    dt_cols.append(col)
+    if not dt_cols:
+        return gdf
+    return gdf.assign(**{c: gdf[c].astype(str) for c in dt_cols})
+
+
 @st.cache_data(show_spinner=False)
-def load_model1_results(geojson_path: str) -> gpd.GeoDataFrame:
-    """Load Model 1 GeoJSON output as a GeoDataFrame, in WGS84 for web mapping."""
+def load_model1_results(
+    geojson_path: str,
+    columns: Optional[Tuple[str, ...]] = None,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+    mtime: Optional[float] = None,
+) -> gpd.GeoDataFrame:
+    """
+    Load Model 1 GeoJSON output as a GeoDataFrame, in WGS84 for web mapping.
+
+    `columns` limits the attributes read (geometry is always included) and `bbox`
+    (minx, miny, maxx, maxy, in the file's CRS) limits the features read. Reads without
+    `bbox` are also persisted to a Parquet sidecar (one per column selection) so a
+    restarted app skips the JSON parse.
+
+    `mtime` is not read; it only joins the cache key, so passing the file's
+    modification time (see `_file_mtime`) reloads the layer when the file changes.
+    """
     path = Path(geojson_path)
     if not path.exists():
         raise FileNotFoundError(f"GeoJSON file not found at: {path}")
 
-    gdf = gpd.read_file(path)
+    cached = _read_parquet_cache(path, "model1", columns=columns, bbox=bbox)
+    if cached is not None:
+        return cached
+
+    gdf = _read_geojson(path, columns=columns, bbox=bbox)
     # Ensure WGS84 for web mapping
-    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+    if gdf.crs is not None and not gdf.crs.equals("EPSG:4326", ignore_axis_order=True):
         gdf = gdf.to_crs(epsg=4326)
+
+    if bbox is None:
+        _write_parquet_cache(path, "model1", gdf, columns)
     return gdf
 
 
 @st.cache_data(show_spinner=False)
-def load_model2_results(geojson_path: str) -> gpd.GeoDataFrame:
-    """Load Model 2 GeoJSON output as a GeoDataFrame, in WGS84 for web mapping."""
+def load_model2_results(
+    geojson_path: str,
+    columns: Optional[Tuple[str, ...]] = None,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+    mtime: Optional[float] = None,
+) -> gpd.GeoDataFrame:
+    """
+    Load Model 2 GeoJSON output as a GeoDataFrame, in WGS84 for web mapping.
+
+    `columns`, `bbox` and `mtime` behave as in `load_model1_results`.
+    """
     path = Path(geojson_path)
     if not path.exists():
         raise FileNotFoundError(f"GeoJSON file not found at: {path}")
 
-    gdf = gpd.read_file(path)
+    cached = _read_parquet_cache(path, "model2", columns=columns, bbox=bbox)
+    if cached is not None:
+        return cached
+
+    gdf = _read_geojson(path, columns=columns, bbox=bbox)
     # Ensure WGS84 for web mapping
-    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+    if gdf.crs is not None and not gdf.crs.equals("EPSG:4326", ignore_axis_order=True):
         gdf = gdf.to_crs(epsg=4326)
     
-    # Convert all datetime/timestamp columns to strings for JSON serialization
-    gdf = gdf.copy()
-    for col in gdf.columns:
-        if col != 'geometry':
-            # Check if column is datetime/timestamp type
-            if pd.api.types.is_datetime64_any_dtype(gdf[col]):
-                gdf[col] = gdf[col].astype(str)
-            elif gdf[col].dtype == 'object':
-                # Check for datetime objects in object columns
-                sample = gdf[col].dropna().head(5)
-                if len(sample) > 0 and isinstance(sample.iloc[0], (pd.Timestamp, pd.DatetimeTZDtype)):
-                    gdf[col] = gdf[col].astype(str)
-    
-    # Fix invalid geometries
-    invalid_count = (~gdf.geometry.is_valid).sum()
-    if invalid_count > 0:
-        # Try to fix invalid geometries using buffer(0) trick
-        gdf.loc[~gdf.geometry.is_valid, 'geometry'] = gdf.loc[~gdf.geometry.is_valid, 'geometry'].buffer(0)
-        # Remove any geometries that are still invalid or empty
-        gdf = gdf[gdf.geometry.is_valid & ~gdf.geometry.is_empty].copy()
-    
+    # Convert datetime/timestamp columns to strings for JSON serialization
+    gdf = _stringify_datetime_columns(gdf)
+
+    # Store the score as float64 once, so the insight helpers can use it without coercion
+    if "urban_water_stress_score" in gdf.columns:
+        gdf["urban_water_stress_score"] = pd.to_numeric(
+            gdf["urban_water_stress_score"], errors="coerce"
+        ).astype(float)
+
+    # Fix invalid geometries (shapely's bulk predicates work on the raw geometry array)
+    geoms = gdf.geometry.to_numpy()
+    invalid = ~shapely.is_valid(geoms)
+    if invalid.any():
+        geoms[invalid] = shapely.make_valid(geoms[invalid])
+        gdf[gdf.geometry.name] = geoms
+        # make_valid output is valid by construction, so only missing or empty geometries
+        # are left to drop; both checks are far cheaper than a second validity pass
+        keep = shapely.is_geometry(geoms) & ~shapely.is_empty(geoms)
+        gdf = gdf.iloc[keep]
+
+    if bbox is None:
+        _write_parquet_cache(path, "model2", gdf, columns)
     return gdf
 
 
 @st.cache_data(show_spinner=False)
-def load_model3_results(geojson_path: str) -> gpd.GeoDataFrame:
-    """Load Model 3 GeoJSON output as a GeoDataFrame, in WGS84 for web mapping."""
+def load_model3_results(
+    geojson_path: str,
+    columns: Optional[Tuple[str, ...]] = None,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+    mtime: Optional[float] = None,
+) -> gpd.GeoDataFrame:
+    """
+    Load Model 3 GeoJSON output as a GeoDataFrame, in WGS84 for web mapping.
+
+    `columns`, `bbox` and `mtime` behave as in `load_model1_results`.
+    """
     path = Path(geojson_path)
     if not path.exists():
         raise FileNotFoundError(f"GeoJSON file not found at: {path}")
 
-    gdf = gpd.read_file(path)
+    cached = _read_parquet_cache(path, "model3", columns=columns, bbox=bbox)
+    if cached is not None:
+        return cached
+
+    gdf = _read_geojson(path, columns=columns, bbox=bbox)
     # Ensure WGS84 for web mapping
-    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+    if gdf.crs is not None and not gdf.crs.equals("EPSG:4326", ignore_axis_order=True):
         gdf = gdf.to_crs(epsg=4326)
     
-    # Convert all datetime/timestamp columns to strings for JSON serialization
-    # This is critical for folium.GeoJson to work properly
-    gdf = gdf.copy()
-    for col in gdf.columns:
-        if col != 'geometry':
-            # Check if column is datetime/timestamp type
-            if pd.api.types.is_datetime64_any_dtype(gdf[col]):
-                gdf[col] = gdf[col].astype(str)
-            elif gdf[col].dtype == 'object':
-                # Check for datetime objects in object columns
-                sample = gdf[col].dropna().head(5)
-                if len(sample) > 0:
-                    first_val = sample.iloc[0]
-                    if isinstance(first_val, (pd.Timestamp, pd.DatetimeTZDtype)) or 'timestamp' in str(type(first_val)).lower():
-                        gdf[col] = gdf[col].astype(str)
-    
-    # Fix invalid geometries
-    invalid_count = (~gdf.geometry.is_valid).sum()
-    if invalid_count > 0:
-        # Try to fix invalid geometries using buffer(0) trick
-        gdf.loc[~gdf.geometry.is_valid, 'geometry'] = gdf.loc[~gdf.geometry.is_valid, 'geometry'].buffer(0)
-        # Remove any geometries that are still invalid or empty
-        gdf = gdf[gdf.geometry.is_valid & ~gdf.geometry.is_empty].copy()
-    
+    # Convert datetime/timestamp columns to strings for JSON serialization
+    gdf = _stringify_datetime_columns(gdf)
+
+    # Store the score as float64 once, so the insight helpers can use it without coercion
+    if "ecosystem_water_sensitivity_score" in gdf.columns:
+        gdf["ecosystem_water_sensitivity_score"] = pd.to_numeric(
+            gdf["ecosystem_water_sensitivity_score"], errors="coerce"
+        ).astype(float)
+
+    # Fix invalid geometries (shapely's bulk predicates work on the raw geometry array)
+    geoms = gdf.geometry.to_numpy()
+    invalid = ~shapely.is_valid(geoms)
+    if invalid.any():
+        geoms[invalid] = shapely.make_valid(geoms[invalid])
+        gdf[gdf.geometry.name] = geoms
+        # make_valid output is valid by construction, so only missing or empty geometries
+        # are left to drop; both checks are far cheaper than a second validity pass
+        keep = shapely.is_geometry(geoms) & ~shapely.is_empty(geoms)
+        gdf = gdf.iloc[keep]
+
+    if bbox is None:
+        _write_parquet_cache(path, "model3", gdf, columns)
     return gdf
 
 
-def make_water_stress_map(gdf: gpd.GeoDataFrame) -> folium.Map:
-    """Create a Folium map colored by final_water_stress_score."""
-    score_col = "final_water_stress_score"
-    if score_col not in gdf.columns:
-        raise KeyError(f"Expected column '{score_col}' in GeoDataFrame.")
+# Maps open at zoom 7, where one screen pixel spans ~0.011° (360° / (256 px * 2**7)),
+# so the default tolerance stays well under a pixel
+_MAP_ZOOM_START = 7
+_DEFAULT_SIMPLIFY_TOL = 0.002
 
-    # Compute map center
-    bounds = gdf.total_bounds  # [minx, miny, maxx, maxy]
-    center_lat = (bounds[1] + bounds[3]) / 2
-    center_lon = (bounds[0] + bounds[2]) / 2
+# Each cached map holds a full Folium tree, so keep the maps of the current layer
+# versions at a few recent tolerances rather than every slider step ever visited
+_MAP_CACHE_MAX_ENTRIES = 8
+
+
+def _simplify_for_web(gdf: gpd.GeoDataFrame, tolerance: float = _DEFAULT_SIMPLIFY_TOL) -> gpd.GeoDataFrame:
+    """
+    Douglas-Peucker simplified copy of `gdf` for the browser map.
+
+    The map ships every vertex to Folium, so dropping sub-pixel detail shrinks the
+    payload without a visible change. A tolerance of 0 returns the layer unchanged.
+    """
+    if tolerance <= 0:
+        return gdf
+    return gdf.set_geometry(gdf.geometry.simplify(tolerance, preserve_topology=True))
+
+
+_NO_DATA_COLOR = "#cccccc"  # Light gray for zero/no data
+
+# Color stops of the green (low) → yellow → red (high) scale, as RGB floats
+_SCORE_COLOR_STOPS = np.array([[0, 128, 0], [255, 255, 0], [255, 0, 0]], dtype=float) / 255.0
+
+
+def _build_color_lut(n_steps: int = 256) -> np.ndarray:
+    """Hex colors of the score scale sampled at `n_steps` evenly spaced positions."""
+    t = np.linspace(0.0, 1.0, n_steps)
+    stop_positions = np.linspace(0.0, 1.0, len(_SCORE_COLOR_STOPS))
+    rgb = np.column_stack(
+        [np.interp(t, stop_positions, _SCORE_COLOR_STOPS[:, c]) for c in range(3)]
+    )
+    rgb_bytes = (rgb * 255.9999).astype(int)
+    return np.array([f"#{r:02x}{g:02x}{b:02x}" for r, g, b in rgb_bytes], dtype=object)
+
+
+# Finer than the eye can tell apart on the map, so per-feature lookups replace interpolation
+_SCORE_COLOR_LUT = _build_color_lut()
+
+
+def _score_colors(
+    scores: np.ndarray, vmin: float, vmax: float, nan_color: str = _NO_DATA_COLOR
+) -> np.ndarray:
+    """
+    Map scores to hex colors on the green → yellow → red scale in one vectorized pass.
+
+    Matches the LinearColormap used for the legend to within one of the 256 steps of
+    `_SCORE_COLOR_LUT`; NaN scores get `nan_color`.
+    """
+    scores = np.asarray(scores, dtype=float)
+    missing = np.isnan(scores)
+    t = np.clip((np.where(missing, vmin, scores) - vmin) / (vmax - vmin), 0.0, 1.0)
+    lut_idx = np.rint(t * (len(_SCORE_COLOR_LUT) - 1)).astype(np.intp)
+    colors = _SCORE_COLOR_LUT[lut_idx]
+    colors[missing] = nan_color
+    return colors
+
+
+def _fill_style(feature: dict) -> dict:
+    """Style a map feature from its precomputed `_fill` color."""
+    fill = feature["properties"]["_fill"]
+    return {
+        "fillColor": fill,
+        "color": "black",
+        "weight": 0.5,
+        "fillOpacity": 0.5 if fill == _NO_DATA_COLOR else 0.7,
+    }
+
+
+def _choropleth_payload(
+    gdf: gpd.GeoDataFrame,
+    score_col: str,
+    hover_fields: Tuple[str, ...],
+    nan_color: str = _NO_DATA_COLOR,
+    zero_as_no_data: bool = False,
+) -> Dict[str, object]:
+    """
+    Everything a choropleth needs from the layer. Not cached itself: maps are built
+    inside the path-keyed `_cached_*_map` helpers, so this runs once per layer version.
 
-    m = folium.Map(location=[center_lat, center_lon], zoom_start=7, tiles="cartodbpositron")
+    Returns the GeoJSON dict (trimmed to the hover fields and score, with a precomputed
+    `_fill` color per feature) so folium.GeoJson skips __geo_interface__, plus the
+    layer bounds and the color scale range.
+    """
+    bounds = gdf.total_bounds  # [minx, miny, maxx, maxy]
 
     # Color scale: green (low) → yellow → red (high)
     vmin = float(gdf[score_col].min())
     vmax = float(gdf[score_col].max())
+    all_zero = zero_as_no_data and vmin == 0 and vmax == 0
     if vmin == vmax:
         # Avoid zero-range scale; expand slightly
         vmin = vmin - 0.001
         vmax = vmax + 0.001
 
-    colormap = LinearColormap(
-        colors=["green", "yellow", "red"],
-        vmin=vmin,
-        vmax=vmax,
-    )
-    colormap.caption = "Final Su Stresi Skoru"
-    colormap.add_to(m)
-
-    # Fields to show on hover
-    hover_fields = [
-        "drought_norm",
-        "groundwater_norm",
-        "agricultural_area_pressure",
-        "final_water_stress_score",
-    ]
-    existing_hover_fields = [f for f in hover_fields if f in gdf.columns]
-
-    def style_function(feature):
-        score = feature["properties"].get(score_col, 0)
-        return {
-            "fillColor": colormap(score),
-            "color": "black",
-            "weight": 0.5,
-            "fillOpacity": 0.7,
-        }
-
-    tooltip = folium.GeoJsonTooltip(
-        fields=existing_hover_fields,
-        aliases=[
-            "Kuraklık (norm):",
-            "Yeraltı Suyu (norm):",
-            "Alan basıncı:",
-            "Final su stresi:",
-        ][: len(existing_hover_fields)],
-        localize=True,
-        sticky=True,
+    # Only hover fields and the score are read on the map; keep the rest out of the payload
+    # and precompute each feature's fill color once instead of in a per-feature callback
+    map_cols = list(dict.fromkeys([*hover_fields, score_col, gdf.geometry.name]))
+    scores = gdf[score_col].to_numpy(dtype=float)
+    fill_colors = _score_colors(scores, vmin, vmax, nan_color=nan_color)
+    if zero_as_no_data:
+        fill_colors[(scores == 0) | all_zero] = nan_color
+    map_gdf = gdf[map_cols].assign(_fill=fill_colors)
+    # Tooltips show at most 3 decimals; full float64 precision only bloats the JSON
+    float_cols = map_gdf.select_dtypes(include="float").columns
+    map_gdf[float_cols] = map_gdf[float_cols].round(3)
+    # 5 decimal places (~1 m) is finer than any web zoom shows and about halves the text per vertex
+    map_gdf[map_gdf.geometry.name] = shapely.transform(
+        map_gdf.geometry.to_numpy(), lambda xy: np.round(xy, 5)
     )
 
-    folium.GeoJson(
-        gdf,
-        style_function=style_function,
-        tooltip=tooltip,
-        name="Water Stress",
-    ).add_to(m)
-
-    folium.LayerControl().add_to(m)
+    return {
+        "geojson": json.loads(map_gdf.to_json(drop_id=True)),
+        "bounds": tuple(float(v) for v in bounds),
+        "vmin": vmin,
+        "vmax": vmax,
+    }
 
-    return m
 
+def _make_choropleth(
+    gdf: gpd.GeoDataFrame,
+    score_col: str,
+    caption: str,
+    hover_fields: List[str],
+    hover_aliases: List[str],
+    layer_name: str,
+    nan_color: str = _NO_DATA_COLOR,
+    zero_as_no_data: bool = False,
+) -> folium.Map:
+    """
+    Build a green → yellow → red choropleth of `score_col` with a hover tooltip.
 
-def make_urban_water_stress_map(gdf: gpd.GeoDataFrame) -> folium.Map:
-    """Create a Folium map colored by urban_water_stress_score."""
-    score_col = "urban_water_stress_score"
+    Hover fields missing from `gdf` are skipped together with their alias. With
+    `zero_as_no_data`, zero scores (and an all-zero layer) are drawn in `nan_color`.
+    """
     if score_col not in gdf.columns:
         raise KeyError(f"Expected column '{score_col}' in GeoDataFrame.")
 
-    # Convert all datetime/timestamp columns to strings for JSON serialization
-    # This is critical for folium.GeoJson to work properly
-    gdf = gdf.copy()
-    for col in gdf.columns:
-        if col != 'geometry':
-            # Check if column is datetime/timestamp type
-            if pd.api.types.is_datetime64_any_dtype(gdf[col]):
-                gdf[col] = gdf[col].astype(str)
-            elif gdf[col].dtype == 'object':
-                # Check for datetime objects in object columns
-                sample = gdf[col].dropna().head(5)
-                if len(sample) > 0:
-                    first_val = sample.iloc[0]
-                    if isinstance(first_val, (pd.Timestamp, pd.DatetimeTZDtype)) or 'timestamp' in str(type(first_val)).lower():
-                        gdf[col] = gdf[col].astype(str)
+    hover_pairs = [(f, a) for f, a in zip(hover_fields, hover_aliases) if f in gdf.columns]
+    existing_hover_fields = tuple(f for f, _ in hover_pairs)
+    payload = _choropleth_payload(
+        gdf, score_col, existing_hover_fields, nan_color=nan_color, zero_as_no_data=zero_as_no_data
+    )
 
     # Compute map center
-    bounds = gdf.total_bounds  # [minx, miny, maxx, maxy]
+    bounds = payload["bounds"]
     center_lat = (bounds[1] + bounds[3]) / 2
     center_lon = (bounds[0] + bounds[2]) / 2
 
-    m = folium.Map(location=[center_lat, center_lon], zoom_start=7, tiles="cartodbpositron")
-
-    # Color scale: green (low) → yellow → red (high)
-    vmin = float(gdf[score_col].min())
-    vmax = float(gdf[score_col].max())
-    all_zero = (vmin == 0 and vmax == 0)
-    
-    if vmin == vmax:
-        # Avoid zero-range scale; expand slightly
-        if all_zero:
-            # If all values are 0, use a small range to show gray/uncolored
-            vmin = -0.001
-            vmax = 0.001
-        else:
-            vmin = vmin - 0.001
-            vmax = vmax + 0.001
+    m = folium.Map(location=[center_lat, center_lon], zoom_start=_MAP_ZOOM_START, tiles="cartodbpositron")
 
     colormap = LinearColormap(
         colors=["green", "yellow", "red"],
-        vmin=vmin,
-        vmax=vmax,
+        vmin=payload["vmin"],
+        vmax=payload["vmax"],
     )
-    colormap.caption = "Kentsel Su Stresi Skoru"
+    colormap.caption = caption
     colormap.add_to(m)
 
-    # Fields to show on hover
-    # Try to find city name column (common names)
-    city_name_col = None
-    for col_name in ["name", "city_name", "city", "NAME", "CITY_NAME", "CITY", "kentAtlasiDegeri"]:
-        if col_name in gdf.columns:
-            city_name_col = col_name
-            break
-
-    hover_fields = []
-    hover_aliases = []
-
-    if city_name_col:
-        hover_fields.append(city_name_col)
-        hover_aliases.append("Şehir:")
-
-    hover_fields.extend([
-        "total_population",
-        "estimated_water_supply",
-        "urban_water_stress_score",
-    ])
-    hover_aliases.extend([
-        "Nüfus:",
-        "Su Arzı:",
-        "Su Stresi Skoru:",
-    ])
-
-    existing_hover_fields = [f for f in hover_fields if f in gdf.columns]
-    existing_aliases = hover_aliases[: len(existing_hover_fields)]
-
-    # Capture all_zero in closure
-    all_zero_flag = all_zero
-    
-    def style_function(feature):
-        score = feature["properties"].get(score_col, 0)
-        # Handle zero scores - show in light gray
-        if all_zero_flag or score == 0 or pd.isna(score):
-            return {
-                "fillColor": "#cccccc",  # Light gray for zero/no data
-                "color": "black",
-                "weight": 0.5,
-                "fillOpacity": 0.5,
-            }
-        return {
-            "fillColor": colormap(score),
-            "color": "black",
-            "weight": 0.5,
-            "fillOpacity": 0.7,
-        }
-
     tooltip = folium.GeoJsonTooltip(
-        fields=existing_hover_fields,
-        aliases=existing_aliases,
+        fields=list(existing_hover_fields),
+        aliases=[a for _, a in hover_pairs],
         localize=True,
         sticky=True,
     )
 
     folium.GeoJson(
-        gdf,
-        style_function=style_function,
+        payload["geojson"],
+        style_function=_fill_style,
         tooltip=tooltip,
-        name="Urban Water Stress",
+        name=layer_name,
     ).add_to(m)
 
     folium.LayerControl().add_to(m)
@@ -296,106 +515,278 @@ def make_urban_water_stress_map(gdf: gpd.GeoDataFrame) -> folium.Map:
     return m
 
 
+def _first_present(gdf: gpd.GeoDataFrame, candidates: List[str]) -> Optional[str]:
+    """Return the first of `candidates` that is a column of `gdf`, or None."""
+    return next((c for c in candidates if c in gdf.columns), None)
+
+
+# Built maps are cached per data version so widget reruns skip the Folium rebuild.
+def make_water_stress_map(gdf: gpd.GeoDataFrame) -> folium.Map:
+    """Create a Folium map colored by final_water_stress_score."""
+    return _make_choropleth(
+        gdf,
+        score_col="final_water_stress_score",
+        caption="Final Su Stresi Skoru",
+        hover_fields=[
+            "drought_norm",
+            "groundwater_norm",
+            "agricultural_area_pressure",
+            "final_water_stress_score",
+        ],
+        hover_aliases=[
+            "Kuraklık (norm):",
+            "Yeraltı Suyu (norm):",
+            "Alan basıncı:",
+            "Final su stresi:",
+        ],
+        layer_name="Water Stress",
+    )
+
+
+def make_urban_water_stress_map(gdf: gpd.GeoDataFrame) -> folium.Map:
+    """Create a Folium map colored by urban_water_stress_score."""
+    if "urban_water_stress_score" not in gdf.columns:
+        raise KeyError("Expected column 'urban_water_stress_score' in GeoDataFrame.")
+
+    # Datetime columns must be strings for JSON serialization; the layer itself is left as is
+    gdf = _stringify_datetime_columns(gdf)
+
+    city_name_col = _first_present(
+        gdf, ["name", "city_name", "city", "NAME", "CITY_NAME", "CITY", "kentAtlasiDegeri"]
+    )
+    name_field = [city_name_col] if city_name_col else []
+    name_alias = ["Şehir:"] if city_name_col else []
+
+    # Zero scores (or an all-zero layer) are shown in light gray
+    return _make_choropleth(
+        gdf,
+        score_col="urban_water_stress_score",
+        caption="Kentsel Su Stresi Skoru",
+        hover_fields=[
+            *name_field,
+            "total_population",
+            "estimated_water_supply",
+            "urban_water_stress_score",
+        ],
+        hover_aliases=[
+            *name_alias,
+            "Nüfus:",
+            "Su Arzı:",
+            "Su Stresi Skoru:",
+        ],
+        layer_name="Urban Water Stress",
+        zero_as_no_data=True,
+    )
+
+
 def make_ecosystem_resilience_map(gdf: gpd.GeoDataFrame) -> folium.Map:
     """Create a Folium map colored by ecosystem_water_sensitivity_score."""
-    score_col = "ecosystem_water_sensitivity_score"
-    if score_col not in gdf.columns:
-        raise KeyError(f"Expected column '{score_col}' in GeoDataFrame.")
+    ecosystem_name_col = _first_present(gdf, ["ka_adi", "name", "ecosystem_name", "NAME"])
+    name_field = [ecosystem_name_col] if ecosystem_name_col else []
+    name_alias = ["Ekosistem:"] if ecosystem_name_col else []
 
-    # Compute map center
-    bounds = gdf.total_bounds  # [minx, miny, maxx, maxy]
-    center_lat = (bounds[1] + bounds[3]) / 2
-    center_lon = (bounds[0] + bounds[2]) / 2
-
-    m = folium.Map(location=[center_lat, center_lon], zoom_start=7, tiles="cartodbpositron")
+    return _make_choropleth(
+        gdf,
+        score_col="ecosystem_water_sensitivity_score",
+        caption="Ekosistem Su Hassasiyeti Skoru",
+        hover_fields=[
+            *name_field,
+            "ecosystem_type",
+            "drought_norm",
+            "groundwater_sensitivity_norm",
+            "wetland_proximity_risk_norm",
+            "protected_area_importance_norm",
+            "ecosystem_water_sensitivity_score",
+        ],
+        hover_aliases=[
+            *name_alias,
+            "Tip:",
+            "Kuraklık (norm):",
+            "Yeraltı Suyu (norm):",
+            "Sulak Alan Riski (norm):",
+            "Önem (norm):",
+            "Hassasiyet Skoru:",
+        ],
+        layer_name="Ecosystem Water Sensitivity",
+    )
 
-    # Color scale: green (low vulnerability) → yellow → red (high vulnerability)
-    vmin = float(gdf[score_col].min())
-    vmax = float(gdf[score_col].max())
-    
-    if vmin == vmax:
-        # Avoid zero-range scale; expand slightly
-        vmin = vmin - 0.001
-        vmax = vmax + 0.001
 
-    colormap = LinearColormap(
-        colors=["green", "yellow", "red"],
-        vmin=vmin,
-        vmax=vmax,
+# Keyed on path and mtime, so tab reruns return the built map without fingerprinting the layer.
+@st.cache_resource(show_spinner=False, max_entries=_MAP_CACHE_MAX_ENTRIES)
+def _cached_water_stress_map(
+    geojson_path: str, mtime: Optional[float], simplify_tol: float = _DEFAULT_SIMPLIFY_TOL
+) -> folium.Map:
+    """Model 1 map for the layer file at `geojson_path` as of `mtime`."""
+    gdf = load_model1_results(geojson_path, columns=_MODEL1_COLUMNS, mtime=mtime)
+    return make_water_stress_map(_simplify_for_web(gdf, simplify_tol))
+
+
+@st.cache_resource(show_spinner=False, max_entries=_MAP_CACHE_MAX_ENTRIES)
+def _cached_urban_map(
+    geojson_path: str, mtime: Optional[float], simplify_tol: float = _DEFAULT_SIMPLIFY_TOL
+) -> folium.Map:
+    """Model 2 map for the layer file at `geojson_path` as of `mtime`."""
+    gdf = load_model2_results(geojson_path, mtime=mtime)
+    return make_urban_water_stress_map(_simplify_for_web(gdf, simplify_tol))
+
+
+@st.cache_resource(show_spinner=False, max_entries=_MAP_CACHE_MAX_ENTRIES)
+def _cached_ecosystem_map(
+    geojson_path: str, mtime: Optional[float], simplify_tol: float = _DEFAULT_SIMPLIFY_TOL
+) -> folium.Map:
+    """Model 3 map for the layer file at `geojson_path` as of `mtime`."""
+    gdf = load_model3_results(geojson_path, mtime=mtime)
+    return make_ecosystem_resilience_map(_simplify_for_web(gdf, simplify_tol))
+
+
+def _simplify_tolerance_input(key: str) -> float:
+    """Harita sadeleştirme toleransı için kenar çubuğu kaydırıcısı (derece)."""
+    return st.sidebar.slider(
+        "Harita sadeleştirme toleransı (°)",
+        min_value=0.0,
+        max_value=0.01,
+        value=_DEFAULT_SIMPLIFY_TOL,
+        step=0.0005,
+        format="%.4f",
+        help="Haritayı çizmeden önce bu boyuttan küçük poligon ayrıntılarını atar. 0 tam ayrıntıyı korur.",
+        key=key,
     )
-    colormap.caption = "Ekosistem Su Hassasiyeti Skoru"
-    colormap.add_to(m)
 
-    # Fields to show on hover
-    # Try to find ecosystem name column
-    ecosystem_name_col = None
-    for col_name in ["ka_adi", "name", "ecosystem_name", "NAME"]:
-        if col_name in gdf.columns:
-            ecosystem_name_col = col_name
-            break
 
-    hover_fields = []
-    hover_aliases = []
+# The leading underscore keeps the map itself out of the cache key: the page is keyed on
+# the same layer file, mtime and tolerance as the cached map it is rendered from, and
+# bounded the same way.
+@st.cache_resource(show_spinner=False, max_entries=_MAP_CACHE_MAX_ENTRIES)
+def _map_html(
+    _m: folium.Map, geojson_path: str, mtime: Optional[float], simplify_tol: float
+) -> str:
+    """Render a cached Folium map to a standalone HTML page once per layer version."""
+    return _m.get_root().render()
+
+
+def _show_map(
+    m: folium.Map,
+    geojson_path: str,
+    mtime: Optional[float],
+    simplify_tol: float,
+    height: int = 600,
+) -> None:
+    """
+    Embed a read-only Folium map built by one of the `_cached_*_map` helpers from the
+    given layer; unlike st_folium, panning and zooming do not rerun the script.
+    """
+    components.html(_map_html(m, geojson_path, mtime, simplify_tol), height=height)
 
-    if ecosystem_name_col:
-        hover_fields.append(ecosystem_name_col)
-        hover_aliases.append("Ekosistem:")
 
-    hover_fields.extend([
-        "ecosystem_type",
-        "drought_norm",
-        "groundwater_sensitivity_norm",
-        "wetland_proximity_risk_norm",
-        "protected_area_importance_norm",
-        "ecosystem_water_sensitivity_score",
-    ])
-    hover_aliases.extend([
-        "Tip:",
-        "Kuraklık (norm):",
-        "Yeraltı Suyu (norm):",
-        "Sulak Alan Riski (norm):",
-        "Önem (norm):",
-        "Hassasiyet Skoru:",
-    ])
-
-    existing_hover_fields = [f for f in hover_fields if f in gdf.columns]
-    existing_aliases = hover_aliases[: len(existing_hover_fields)]
-
-    def style_function(feature):
-        score = feature["properties"].get(score_col, 0)
-        if pd.isna(score):
-            return {
-                "fillColor": "#cccccc",  # Light gray for no data
-                "color": "black",
-                "weight": 0.5,
-                "fillOpacity": 0.5,
-            }
-        return {
-            "fillColor": colormap(score),
-            "color": "black",
-            "weight": 0.5,
-            "fillOpacity": 0.7,
-        }
+def _score_array(gdf: gpd.GeoDataFrame, score_col: str) -> np.ndarray:
+    """
+    Score column as a float64 array, with non-numeric values as NaN.
 
-    tooltip = folium.GeoJsonTooltip(
-        fields=existing_hover_fields,
-        aliases=existing_aliases,
-        localize=True,
-        sticky=True,
+    The Model 2/3 loaders already store their score as float64, in which case no
+    coercion pass runs.
+    """
+    scores = gdf[score_col]
+    if scores.dtype != np.float64:
+        scores = pd.to_numeric(scores, errors="coerce")
+    return scores.to_numpy(dtype=float)
+
+
+def _to_num(values: pd.Series) -> np.ndarray:
+    """
+    Column as a float64 array with non-numeric values and NaN as 0.0.
+
+    Same values as pd.to_numeric(values, errors="coerce").fillna(0.0), but numeric
+    columns skip the coercion and the intermediate Series.
+    """
+    if not pd.api.types.is_numeric_dtype(values.dtype):
+        values = pd.to_numeric(values, errors="coerce")
+    arr = values.to_numpy(dtype=float, na_value=np.nan)
+    return np.where(np.isnan(arr), 0.0, arr)
+
+
+def _band_stats(scores: np.ndarray, quantiles: Tuple[float, ...]) -> Tuple[float, ...]:
+    """
+    Score percentiles used as risk-band thresholds, ignoring NaN scores.
+
+    Not cached itself: every caller is a cached insight helper.
+    """
+    scores = scores[~np.isnan(scores)]
+    # One partition pass for all cut-points instead of one per quantile
+    return tuple(float(q) for q in np.quantile(scores, quantiles))
+
+
+def _extent(geom_bounds: np.ndarray) -> np.ndarray:
+    """Combined [minx, miny, maxx, maxy] of per-geometry bounds rows, ignoring missing ones."""
+    return np.concatenate(
+        [np.nanmin(geom_bounds[:, :2], axis=0), np.nanmax(geom_bounds[:, 2:], axis=0)]
     )
 
-    folium.GeoJson(
-        gdf,
-        style_function=style_function,
-        tooltip=tooltip,
-        name="Ecosystem Water Sensitivity",
-    ).add_to(m)
 
-    folium.LayerControl().add_to(m)
+def _cluster_narrative(gdf: gpd.GeoDataFrame, high_mask: np.ndarray) -> List[str]:
+    """Describe where the high-risk zones sit relative to the whole study area."""
+    cluster_insights: List[str] = []
+    if not high_mask.any() or not gdf.geometry.notna().any():
+        return cluster_insights
+
+    # One bounds pass over the geometries serves both the study-area and high-risk extents
+    geom_bounds = shapely.bounds(gdf.geometry.to_numpy())
+    overall_bounds = _extent(geom_bounds)  # minx, miny, maxx, maxy
+    overall_center_lat = (overall_bounds[1] + overall_bounds[3]) / 2
+    overall_center_lon = (overall_bounds[0] + overall_bounds[2]) / 2
+
+    # Only the high-risk geometries are needed, so slice the geometry array, not the frame
+    high_geoms = gdf.geometry.to_numpy()[high_mask]
+    # Assume already in WGS84; centroids are approximate but good enough for narrative.
+    # shapely's vectorized centroid skips the per-element GeoSeries dispatch.
+    high_centroids = shapely.centroid(high_geoms)
+    high_center_lat = float(np.nanmean(shapely.get_y(high_centroids)))
+    high_center_lon = float(np.nanmean(shapely.get_x(high_centroids)))
+
+    lat_desc = "central"
+    lon_desc = "central"
+    lat_delta = high_center_lat - overall_center_lat
+    lon_delta = high_center_lon - overall_center_lon
+
+    # Simple directional description with a small tolerance
+    tol = 0.1 * max(
+        abs(overall_bounds[3] - overall_bounds[1]),
+        abs(overall_bounds[2] - overall_bounds[0]),
+    )
 
-    return m
+    if lat_delta > tol:
+        lat_desc = "northern"
+    elif lat_delta < -tol:
+        lat_desc = "southern"
+
+    if lon_delta > tol:
+        lon_desc = "eastern"
+    elif lon_delta < -tol:
+        lon_desc = "western"
+
+    # Assess how compact the high-risk cluster is
+    high_bounds = _extent(geom_bounds[high_mask])
+    lat_span_ratio = abs(high_bounds[3] - high_bounds[1]) / max(
+        1e-9, abs(overall_bounds[3] - overall_bounds[1])
+    )
+    lon_span_ratio = abs(high_bounds[2] - high_bounds[0]) / max(
+        1e-9, abs(overall_bounds[2] - overall_bounds[0])
+    )
+
+    if lat_span_ratio < 0.5 and lon_span_ratio < 0.5:
+        cluster_insights.append(
+            f"High water stress zones are strongly clustered in the {lat_desc}-{lon_desc} "
+            "part of the study area."
+        )
+    else:
+        cluster_insights.append(
+            "High water stress zones are distributed across the region without a single "
+            "dominant cluster, indicating widespread vulnerability."
+        )
+
+    return cluster_insights
 
 
+# Insights are pure functions of the layer, so reruns on unchanged data reuse them.
 def _compute_automated_insights(
     gdf: gpd.GeoDataFrame, score_col: str = "final_water_stress_score"
 ) -> Dict[str, object]:
@@ -416,8 +807,9 @@ def _compute_automated_insights(
             "recommended_actions": [],
         }
 
-    scores = pd.to_numeric(gdf[score_col], errors="coerce").dropna()
-    if scores.empty:
+    scores = _score_array(gdf, score_col)
+    n_total = int(np.count_nonzero(~np.isnan(scores)))
+    if n_total == 0:
         return {
             "high_risk_share_pct": 0.0,
             "medium_risk_share_pct": 0.0,
@@ -426,76 +818,23 @@ def _compute_automated_insights(
             "recommended_actions": [],
         }
 
-    n_total = len(scores)
-    p95 = float(scores.quantile(0.95))
-    p40 = float(scores.quantile(0.40))
-    p70 = float(scores.quantile(0.70))
+    p95, p40, p70 = _band_stats(scores, (0.95, 0.40, 0.70))
 
-    high_mask = gdf[score_col] >= p95
-    medium_mask = (gdf[score_col] >= p40) & (gdf[score_col] <= p70)
-    low_mask = gdf[score_col] < p40
-
-    n_high = int(high_mask.sum())
-    n_medium = int(medium_mask.sum())
-    n_low = int(low_mask.sum())
+    # The high mask is kept for the cluster narrative; low and medium come from one
+    # bucketing pass. Edges [p40, nextafter(p70)] give bucket 0 = below p40 and bucket
+    # 1 = p40..p70 with both ends inclusive; scores above p70 and NaN land in bucket 2.
+    high_mask = scores >= p95
+    n_high = int(np.count_nonzero(high_mask))
+    n_low, n_medium = np.bincount(
+        np.digitize(scores, [p40, np.nextafter(p70, np.inf)]), minlength=3
+    )[:2].tolist()
 
     high_share = (n_high / n_total) * 100 if n_total else 0.0
     medium_share = (n_medium / n_total) * 100 if n_total else 0.0
     low_share = (n_low / n_total) * 100 if n_total else 0.0
 
     # Spatial clustering: compare high-risk centroid to overall centroid
-    cluster_insights: List[str] = []
-    if n_high > 0 and gdf.geometry.notna().any():
-        overall_bounds = gdf.total_bounds  # minx, miny, maxx, maxy
-        overall_center_lat = (overall_bounds[1] + overall_bounds[3]) / 2
-        overall_center_lon = (overall_bounds[0] + overall_bounds[2]) / 2
-
-        high_gdf = gdf.loc[high_mask].copy()
-        # Assume already in WGS84; centroids are approximate but good enough for narrative
-        high_centroid = high_gdf.geometry.centroid
-        high_center_lat = float(high_centroid.y.mean())
-        high_center_lon = float(high_centroid.x.mean())
-
-        lat_desc = "central"
-        lon_desc = "central"
-        lat_delta = high_center_lat - overall_center_lat
-        lon_delta = high_center_lon - overall_center_lon
-
-        # Simple directional description with a small tolerance
-        tol = 0.1 * max(
-            abs(overall_bounds[3] - overall_bounds[1]),
-            abs(overall_bounds[2] - overall_bounds[0]),
-        )
-
-        if lat_delta > tol:
-            lat_desc = "northern"
-        elif lat_delta < -tol:
-            lat_desc = "southern"
-
-        if lon_delta > tol:
-            lon_desc = "eastern"
-        elif lon_delta < -tol:
-            lon_desc = "western"
-
-        # Assess how compact the high-risk cluster is
-        high_bounds = high_gdf.total_bounds
-        lat_span_ratio = abs(high_bounds[3] - high_bounds[1]) / max(
-            1e-9, abs(overall_bounds[3] - overall_bounds[1])
-        )
-        lon_span_ratio = abs(high_bounds[2] - high_bounds[0]) / max(
-            1e-9, abs(overall_bounds[2] - overall_bounds[0])
-        )
-
-        if lat_span_ratio < 0.5 and lon_span_ratio < 0.5:
-            cluster_insights.append(
-                f"High water stress zones are strongly clustered in the {lat_desc}-{lon_desc} "
-                "part of the study area."
-            )
-        else:
-            cluster_insights.append(
-                "High water stress zones are distributed across the region without a single "
-                "dominant cluster, indicating widespread vulnerability."
-            )
+    cluster_insights = _cluster_narrative(gdf, high_mask)
 
     # Recommended actions based on band sizes
     recommended_actions: List[str] = []
@@ -533,6 +872,25 @@ def _compute_automated_insights(
     }
 
 
+@st.cache_data(show_spinner=False)
+def _cached_automated_insights(
+    geojson_path: str, mtime: Optional[float], score_col: str = "final_water_stress_score"
+) -> Dict[str, object]:
+    """Model 1 insights for the layer file at `geojson_path` as of `mtime`."""
+    gdf = load_model1_results(geojson_path, columns=_MODEL1_COLUMNS, mtime=mtime)
+    return _compute_automated_insights(gdf, score_col=score_col)
+
+
+def _top_n_positions(scores: np.ndarray, n: int) -> np.ndarray:
+    """
+    Positions of the `n` largest scores, highest first, for use with `.iloc`.
+
+    Every top-N table goes through here, so all of them rank the same way: pandas'
+    nlargest with keep="first" (earliest rows win ties, NaN scores only fill the tail).
+    """
+    return pd.Series(scores).nlargest(n).index.to_numpy()
+
+
 def _compute_score_decomposition(
     gdf: gpd.GeoDataFrame, top_n: int = 5
 ) -> pd.DataFrame:
@@ -554,61 +912,42 @@ def _compute_score_decomposition(
     if missing:
         return pd.DataFrame()
 
-    # Get top N highest-risk zones
-    top_zones = gdf.nlargest(top_n, "final_water_stress_score").copy()
-
-    # Extract component values
-    drought_vals = pd.to_numeric(top_zones["drought_norm"], errors="coerce").fillna(0.0)
-    groundwater_vals = pd.to_numeric(
-        top_zones["groundwater_norm"], errors="coerce"
-    ).fillna(0.0)
-    area_vals = pd.to_numeric(
-        top_zones["agricultural_area_pressure"], errors="coerce"
-    ).fillna(0.0)
+    # Get top N highest-risk zones; only the score column is sorted and geometry is left behind
+    scores = pd.to_numeric(gdf["final_water_stress_score"], errors="coerce").to_numpy(dtype=float)
+    top_zones = gdf[required_cols].iloc[_top_n_positions(scores, top_n)]
+
+    # Extract component values as a zones x [drought, groundwater, area] matrix
+    components = np.stack(
+        [
+            pd.to_numeric(top_zones[c], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+            for c in ("drought_norm", "groundwater_norm", "agricultural_area_pressure")
+        ],
+        axis=1,
+    )
     final_scores = pd.to_numeric(
         top_zones["final_water_stress_score"], errors="coerce"
-    ).fillna(0.0)
+    ).fillna(0.0).to_numpy(dtype=float)
 
     # Compute weighted contributions
     # Score = 0.45 * drought + 0.35 * groundwater + 0.20 * area
-    drought_contribution = 0.45 * drought_vals
-    groundwater_contribution = 0.35 * groundwater_vals
-    area_contribution = 0.20 * area_vals
+    contributions = components * np.array([0.45, 0.35, 0.20])
 
     # Compute percentage contributions (avoid division by zero)
-    total_contribution = drought_contribution + groundwater_contribution + area_contribution
     epsilon = 1e-10
-    drought_pct = (drought_contribution / (total_contribution + epsilon)) * 100
-    groundwater_pct = (groundwater_contribution / (total_contribution + epsilon)) * 100
-    area_pct = (area_contribution / (total_contribution + epsilon)) * 100
+    pct = contributions / (contributions.sum(axis=1, keepdims=True) + epsilon) * 100
 
-    # Determine dominant risk factor
-    contributions_df = pd.DataFrame(
-        {
-            "drought_pct": drought_pct,
-            "groundwater_pct": groundwater_pct,
-            "area_pct": area_pct,
-        }
-    )
-    dominant_factors = []
-    for idx in contributions_df.index:
-        row = contributions_df.loc[idx]
-        max_col = row.idxmax()
-        if max_col == "drought_pct":
-            dominant_factors.append("Drought")
-        elif max_col == "groundwater_pct":
-            dominant_factors.append("Groundwater")
-        else:
-            dominant_factors.append("Area Pressure")
+    # Determine dominant risk factor (first factor wins ties, as with idxmax)
+    factor_labels = np.array(["Drought", "Groundwater", "Area Pressure"])
+    dominant_factors = factor_labels[np.argmax(pct, axis=1)].tolist()
 
     # Build result DataFrame
     result = pd.DataFrame(
         {
             "zone_index": top_zones.index,
-            "final_water_stress_score": final_scores.values,
-            "drought_contribution_pct": drought_pct.values,
-            "groundwater_contribution_pct": groundwater_pct.values,
-            "area_contribution_pct": area_pct.values,
+            "final_water_stress_score": final_scores,
+            "drought_contribution_pct": pct[:, 0],
+            "groundwater_contribution_pct": pct[:, 1],
+            "area_contribution_pct": pct[:, 2],
             "dominant_risk_factor": dominant_factors,
         }
     )
@@ -616,6 +955,15 @@ def _compute_score_decomposition(
     return result
 
 
+@st.cache_data(show_spinner=False)
+def _cached_score_decomposition(
+    geojson_path: str, mtime: Optional[float], top_n: int = 5
+) -> pd.DataFrame:
+    """Model 1 score decomposition for the layer file at `geojson_path` as of `mtime`."""
+    gdf = load_model1_results(geojson_path, columns=_MODEL1_COLUMNS, mtime=mtime)
+    return _compute_score_decomposition(gdf, top_n=top_n)
+
+
 def _generate_explainability_summary(decomp_df: pd.DataFrame) -> str:
     """Generate a narrative summary of the score decomposition."""
     if decomp_df.empty:
@@ -659,6 +1007,11 @@ def _generate_explainability_summary(decomp_df: pd.DataFrame) -> str:
     return " ".join(summary_parts)
 
 
+def _markdown_list(title: str, items: List[str]) -> None:
+    """Render a bold title and its bullet items as one markdown element."""
+    st.markdown("\n".join([f"**{title}**", "", *(f"- {item}" for item in items)]))
+
+
 def render_model1_tab() -> None:
     """Render the Model 1 (Agricultural Water Stress) tab."""
     st.header("Model 1: Tarımsal Su Stresi İstihbaratı")
@@ -677,10 +1030,12 @@ def render_model1_tab() -> None:
         help="Pipeline tarafından üretilen `model1_water_stress.geojson` dosyasının yolu.",
         key="model1_path",
     )
+    simplify_tol = _simplify_tolerance_input("model1_simplify_tol")
 
     # ---- Load data ----
+    mtime = _file_mtime(geojson_path_str)
     try:
-        gdf = load_model1_results(geojson_path_str)
+        gdf = load_model1_results(geojson_path_str, columns=_MODEL1_COLUMNS, mtime=mtime)
     except FileNotFoundError as e:
         st.error(str(e))
         st.info("GeoJSON çıktısını oluşturmak için önce Model 1'i çalıştırın.")
@@ -703,32 +1058,27 @@ def render_model1_tab() -> None:
 
     with map_col:
         st.subheader("Su Stresi Haritası")
-        m = make_water_stress_map(gdf)
-        st_folium(m, width="100%", height=600)
+        m = _cached_water_stress_map(geojson_path_str, mtime, simplify_tol)
+        _show_map(m, geojson_path_str, mtime, simplify_tol, height=600)
 
     with table_col:
         st.subheader("En Yüksek Riskli 10 Tarımsal Bölge")
-        top10 = (
-            gdf[
-                [
-                    score_col,
-                    "drought_norm",
-                    "groundwater_norm",
-                    "agricultural_area_pressure",
-                ]
+        # Projecting first leaves geometry out; only the 10 selected rows are taken
+        top10 = gdf[
+            [
+                score_col,
+                "drought_norm",
+                "groundwater_norm",
+                "agricultural_area_pressure",
             ]
-            .copy()
-        )
-        top10 = top10.sort_values(score_col, ascending=False).head(10)
-        if "geometry" in top10.columns:
-            top10 = pd.DataFrame(top10.drop(columns="geometry"))
+        ].iloc[_top_n_positions(_score_array(gdf, score_col), 10)]
         st.dataframe(top10.reset_index(drop=True), use_container_width=True)
 
     # ---- Automated insights panel ----
     st.markdown("---")
     st.subheader("Otomatik İçgörüler")
 
-    insights = _compute_automated_insights(gdf, score_col=score_col)
+    insights = _cached_automated_insights(geojson_path_str, mtime, score_col=score_col)
 
     st.markdown(
         f"**Yüksek su stresi altındaki bölgelerin payı (en üst %5):** "
@@ -745,15 +1095,11 @@ def render_model1_tab() -> None:
 
     cluster_insights = insights.get("cluster_insights") or []
     if cluster_insights:
-        st.markdown("**Riskin mekansal desenleri:**")
-        for line in cluster_insights:
-            st.markdown(f"- {line}")
+        _markdown_list("Riskin mekansal desenleri:", cluster_insights)
 
     recommended_actions = insights.get("recommended_actions") or []
     if recommended_actions:
-        st.markdown("**Önerilen eylemler:**")
-        for action in recommended_actions:
-            st.markdown(f"- {action}")
+        _markdown_list("Önerilen eylemler:", recommended_actions)
 
     # ---- Explainability section ----
     st.markdown("---")
@@ -767,7 +1113,7 @@ def render_model1_tab() -> None:
         "(0.20 × agricultural_area_pressure)`."
     )
 
-    decomp_df = _compute_score_decomposition(gdf, top_n=5)
+    decomp_df = _cached_score_decomposition(geojson_path_str, mtime, top_n=5)
 
     if decomp_df.empty:
         st.warning(
@@ -836,8 +1182,9 @@ def _compute_urban_insights(
             "recommended_actions": [],
         }
 
-    scores = pd.to_numeric(gdf[score_col], errors="coerce").dropna()
-    if scores.empty:
+    scores = _score_array(gdf, score_col)
+    n_total = int(np.count_nonzero(~np.isnan(scores)))
+    if n_total == 0:
         return {
             "high_risk_share_pct": 0.0,
             "medium_risk_share_pct": 0.0,
@@ -846,17 +1193,16 @@ def _compute_urban_insights(
             "recommended_actions": [],
         }
 
-    n_total = len(scores)
-    p80 = float(scores.quantile(0.80))  # Top 20%
-    p40 = float(scores.quantile(0.40))  # Bottom 40% threshold
+    # Top 20% / bottom 40% thresholds
+    p80, p40 = _band_stats(scores, (0.80, 0.40))
 
-    high_mask = gdf[score_col] >= p80
-    medium_mask = (gdf[score_col] >= p40) & (gdf[score_col] < p80)
-    low_mask = gdf[score_col] < p40
+    high_mask = scores >= p80
+    medium_mask = (scores >= p40) & (scores < p80)
+    low_mask = scores < p40
 
-    n_high = int(high_mask.sum())
-    n_medium = int(medium_mask.sum())
-    n_low = int(low_mask.sum())
+    n_high = int(np.count_nonzero(high_mask))
+    n_medium = int(np.count_nonzero(medium_mask))
+    n_low = int(np.count_nonzero(low_mask))
 
     high_share = (n_high / n_total) * 100 if n_total else 0.0
     medium_share = (n_medium / n_total) * 100 if n_total else 0.0
@@ -866,20 +1212,18 @@ def _compute_urban_insights(
     pattern_insights: List[str] = []
 
     if n_high > 0:
-        high_risk_cities = gdf.loc[high_mask].copy()
-        all_cities = gdf.copy()
+        high_idx = np.flatnonzero(high_mask)
 
-        # Check if high-risk cities are primarily large-population cities
-        if "total_population" in gdf.columns:
-            high_pop = pd.to_numeric(
-                high_risk_cities["total_population"], errors="coerce"
-            ).fillna(0.0)
-            all_pop = pd.to_numeric(
-                all_cities["total_population"], errors="coerce"
-            ).fillna(0.0)
+        # Coerce each driver column once; high-risk values are slices of these arrays
+        pop = _to_num(gdf["total_population"]) if "total_population" in gdf.columns else None
+        supply = (
+            _to_num(gdf["estimated_water_supply"]) if "estimated_water_supply" in gdf.columns else None
+        )
 
-            median_pop_all = all_pop.median()
-            median_pop_high = high_pop.median()
+        # Check if high-risk cities are primarily large-population cities
+        if pop is not None:
+            median_pop_all = float(np.median(pop))
+            median_pop_high = float(np.median(pop[high_idx]))
 
             if median_pop_high > median_pop_all * 1.5:
                 pattern_insights.append(
@@ -894,32 +1238,15 @@ def _compute_urban_insights(
                 )
 
         # Analyze correlation: population pressure vs water supply
-        if "total_population" in gdf.columns and "estimated_water_supply" in gdf.columns:
-            high_pop = pd.to_numeric(
-                high_risk_cities["total_population"], errors="coerce"
-            ).fillna(0.0)
-            high_supply = pd.to_numeric(
-                high_risk_cities["estimated_water_supply"], errors="coerce"
-            ).fillna(0.0)
-
-            all_pop = pd.to_numeric(
-                all_cities["total_population"], errors="coerce"
-            ).fillna(0.0)
-            all_supply = pd.to_numeric(
-                all_cities["estimated_water_supply"], errors="coerce"
-            ).fillna(0.0)
-
+        if pop is not None and supply is not None:
             # Normalize for comparison
-            max_pop = all_pop.max()
-            max_supply = all_supply.max()
+            max_pop = pop.max()
+            max_supply = supply.max()
 
             if max_pop > 0 and max_supply > 0:
-                high_pop_norm = high_pop / max_pop
-                high_supply_norm = high_supply / max_supply
-
                 # Compare medians
-                median_pop_norm_high = high_pop_norm.median()
-                median_supply_norm_high = high_supply_norm.median()
+                median_pop_norm_high = float(np.median(pop[high_idx] / max_pop))
+                median_supply_norm_high = float(np.median(supply[high_idx] / max_supply))
 
                 if median_pop_norm_high > median_supply_norm_high * 1.3:
                     pattern_insights.append(
@@ -937,14 +1264,15 @@ def _compute_urban_insights(
                         "pressure and water supply constraints."
                     )
 
+    # Lower-cased once; joined with newlines so a phrase cannot span two insights
+    insights_text = "\n".join(pattern_insights).lower()
+
     # Recommended actions based on patterns and risk distribution
     recommended_actions: List[str] = []
 
     if high_share >= 15:
         # Check if it's population-driven or supply-driven
-        if pattern_insights and any(
-            "population pressure" in insight.lower() for insight in pattern_insights
-        ):
+        if "population pressure" in insights_text:
             recommended_actions.append(
                 "**Demand management** for large cities: Implement water conservation "
                 "programs, leak reduction initiatives, and tiered pricing structures to "
@@ -955,9 +1283,7 @@ def _compute_urban_insights(
                 "smart metering, greywater recycling, and rainwater harvesting in "
                 "high-population stress zones."
             )
-        elif pattern_insights and any(
-            "low water supply" in insight.lower() for insight in pattern_insights
-        ):
+        elif "low water supply" in insights_text:
             recommended_actions.append(
                 "**Infrastructure investment** for supply-limited cities: Develop new "
                 "water sources, expand reservoir capacity, and improve water distribution "
@@ -1002,6 +1328,15 @@ def _compute_urban_insights(
     }
 
 
+@st.cache_data(show_spinner=False)
+def _cached_urban_insights(
+    geojson_path: str, mtime: Optional[float], score_col: str = "urban_water_stress_score"
+) -> Dict[str, object]:
+    """Model 2 insights for the layer file at `geojson_path` as of `mtime`."""
+    gdf = load_model2_results(geojson_path, mtime=mtime)
+    return _compute_urban_insights(gdf, score_col=score_col)
+
+
 def _compute_ecosystem_insights(
     gdf: gpd.GeoDataFrame, score_col: str = "ecosystem_water_sensitivity_score"
 ) -> Dict[str, object]:
@@ -1022,8 +1357,9 @@ def _compute_ecosystem_insights(
             "recommended_actions": [],
         }
 
-    scores = pd.to_numeric(gdf[score_col], errors="coerce").dropna()
-    if scores.empty:
+    score_arr = _score_array(gdf, score_col)
+    n_total = int(np.count_nonzero(~np.isnan(score_arr)))
+    if n_total == 0:
         return {
             "high_risk_share_pct": 0.0,
             "medium_risk_share_pct": 0.0,
@@ -1032,17 +1368,17 @@ def _compute_ecosystem_insights(
             "recommended_actions": [],
         }
 
-    n_total = len(scores)
-    p80 = float(scores.quantile(0.80))  # Top 20%
-    p40 = float(scores.quantile(0.40))  # Bottom 40% threshold
+    # Top 20% / bottom 40% thresholds, from one np.quantile call
+    p80, p40 = _band_stats(score_arr, (0.80, 0.40))
 
-    high_mask = gdf[score_col] >= p80
-    medium_mask = (gdf[score_col] >= p40) & (gdf[score_col] < p80)
-    low_mask = gdf[score_col] < p40
+    # Band masks as plain bool arrays over the float scores (NaN falls in no band)
+    high_mask = score_arr >= p80
+    medium_mask = (score_arr >= p40) & (score_arr < p80)
+    low_mask = score_arr < p40
 
-    n_high = int(high_mask.sum())
-    n_medium = int(medium_mask.sum())
-    n_low = int(low_mask.sum())
+    n_high = int(np.count_nonzero(high_mask))
+    n_medium = int(np.count_nonzero(medium_mask))
+    n_low = int(np.count_nonzero(low_mask))
 
     high_share = (n_high / n_total) * 100 if n_total else 0.0
     medium_share = (n_medium / n_total) * 100 if n_total else 0.0
@@ -1052,9 +1388,6 @@ def _compute_ecosystem_insights(
     pattern_insights: List[str] = []
 
     if n_high > 0:
-        high_risk_ecosystems = gdf.loc[high_mask].copy()
-        all_ecosystems = gdf.copy()
-
         # Analyze component contributions
         component_cols = [
             "drought_norm",
@@ -1062,19 +1395,15 @@ def _compute_ecosystem_insights(
             "wetland_proximity_risk_norm",
             "protected_area_importance_norm",
         ]
+        present_cols = [c for c in component_cols if c in gdf.columns]
 
-        for col in component_cols:
-            if col in gdf.columns:
-                high_vals = pd.to_numeric(
-                    high_risk_ecosystems[col], errors="coerce"
-                ).fillna(0.0)
-                all_vals = pd.to_numeric(
-                    all_ecosystems[col], errors="coerce"
-                ).fillna(0.0)
-
-                mean_high = high_vals.mean()
-                mean_all = all_vals.mean()
+        if present_cols:
+            # One (ecosystems x components) matrix; column means replace per-column reductions
+            components = np.column_stack([_to_num(gdf[c]) for c in present_cols])
+            means_high = components[high_mask].mean(axis=0)
+            means_all = components.mean(axis=0)
 
+            for col, mean_high, mean_all in zip(present_cols, means_high, means_all):
                 if mean_high > mean_all * 1.2:
                     col_name = col.replace("_norm", "").replace("_", " ").title()
                     pattern_insights.append(
@@ -1083,21 +1412,34 @@ def _compute_ecosystem_insights(
                         "factor is a key driver of vulnerability."
                     )
 
-        # Analyze ecosystem type distribution
+        # Analyze ecosystem type distribution: one factorization, then integer counts
         if "ecosystem_type" in gdf.columns:
-            high_types = high_risk_ecosystems["ecosystem_type"].value_counts()
-            all_types = all_ecosystems["ecosystem_type"].value_counts()
+            codes, uniques = pd.factorize(gdf["ecosystem_type"])
+            high_codes = codes[high_mask]
+            high_codes = high_codes[high_codes >= 0]  # -1 marks a missing type
+            high_counts = np.bincount(high_codes, minlength=len(uniques))
+            all_counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            high_pcts = (high_counts / n_high) * 100
+            all_pcts = (all_counts / n_total) * 100
+
+            # Report in value_counts() order: most frequent high-risk type first,
+            # ties by first appearance among the high-risk ecosystems
+            high_types, first_seen = np.unique(high_codes, return_index=True)
+            high_types = high_types[np.lexsort((first_seen, -high_counts[high_types]))]
+            overrepresented = high_types[high_pcts[high_types] > all_pcts[high_types] * 1.3]
+
+            for code in overrepresented:
+                etype = uniques[code]
+                high_pct = high_pcts[code]
+                all_pct = all_pcts[code]
+                pattern_insights.append(
+                    f"**{etype}s** are overrepresented in high-risk category "
+                    f"({high_pct:.1f}% vs {all_pct:.1f}% overall), suggesting "
+                    "type-specific vulnerability factors."
+                )
 
-            for etype in high_types.index:
-                high_pct = (high_types[etype] / n_high) * 100
-                all_pct = (all_types.get(etype, 0) / n_total) * 100
-
-                if high_pct > all_pct * 1.3:
-                    pattern_insights.append(
-                        f"**{etype}s** are overrepresented in high-risk category "
-                        f"({high_pct:.1f}% vs {all_pct:.1f}% overall), suggesting "
-                        "type-specific vulnerability factors."
-                    )
+    # Lower-cased once; joined with newlines so a phrase cannot span two insights
+    insights_text = "\n".join(pattern_insights).lower()
 
     # Recommended actions based on patterns and risk distribution
     recommended_actions: List[str] = []
@@ -1120,13 +1462,13 @@ def _compute_ecosystem_insights(
             "projected climate change impacts."
         )
 
-    if pattern_insights and any("drought" in insight.lower() for insight in pattern_insights):
+    if "drought" in insights_text:
         recommended_actions.append(
             "**Climate adaptation** priority: High drought exposure requires integration "
             "of climate adaptation measures into all protected area management plans."
         )
 
-    if pattern_insights and any("groundwater" in insight.lower() for insight in pattern_insights):
+    if "groundwater" in insights_text:
         recommended_actions.append(
             "**Groundwater protection** critical: Implement protection zones around "
             "ecosystem-dependent aquifers and coordinate groundwater management at basin scale."
@@ -1147,6 +1489,17 @@ def _compute_ecosystem_insights(
     }
 
 
+@st.cache_data(show_spinner=False)
+def _cached_ecosystem_insights(
+    geojson_path: str,
+    mtime: Optional[float],
+    score_col: str = "ecosystem_water_sensitivity_score",
+) -> Dict[str, object]:
+    """Model 3 insights for the layer file at `geojson_path` as of `mtime`."""
+    gdf = load_model3_results(geojson_path, mtime=mtime)
+    return _compute_ecosystem_insights(gdf, score_col=score_col)
+
+
 def render_model2_tab() -> None:
     """Render the Model 2 (Urban Water Stress) tab."""
     st.header("Model 2: Kentsel Su Stresi İstihbaratı")
@@ -1166,10 +1519,12 @@ def render_model2_tab() -> None:
         help="Pipeline tarafından üretilen `model2_urban_water_stress.geojson` dosyasının yolu.",
         key="model2_path",
     )
+    simplify_tol = _simplify_tolerance_input("model2_simplify_tol")
 
     # ---- Load data ----
+    mtime = _file_mtime(geojson_path_str)
     try:
-        gdf = load_model2_results(geojson_path_str)
+        gdf = load_model2_results(geojson_path_str, mtime=mtime)
     except FileNotFoundError as e:
         st.error(str(e))
         st.info("GeoJSON çıktısını oluşturmak için önce Model 2'yi çalıştırın.")
@@ -1192,8 +1547,8 @@ def render_model2_tab() -> None:
 
     with map_col:
         st.subheader("Kentsel Su Stresi Haritası")
-        m = make_urban_water_stress_map(gdf)
-        st_folium(m, width="100%", height=600)
+        m = _cached_urban_map(geojson_path_str, mtime, simplify_tol)
+        _show_map(m, geojson_path_str, mtime, simplify_tol, height=600)
 
     with table_col:
         st.subheader("En Yüksek Stresli 10 Şehir")
@@ -1208,24 +1563,11 @@ def render_model2_tab() -> None:
         if city_name_col:
             display_cols.insert(0, city_name_col)
 
-        top10 = gdf[display_cols].copy()
-        top10 = top10.sort_values(score_col, ascending=False).head(10)
-        if "geometry" in top10.columns:
-            top10 = pd.DataFrame(top10.drop(columns="geometry"))
-
-        # Format numeric columns for better readability
-        if "total_population" in top10.columns:
-            top10["total_population"] = top10["total_population"].apply(
-                lambda x: f"{x:,.0f}" if pd.notna(x) else "N/A"
-            )
-        if "estimated_water_supply" in top10.columns:
-            top10["estimated_water_supply"] = top10["estimated_water_supply"].apply(
-                lambda x: f"{x:.2f}" if pd.notna(x) else "N/A"
-            )
-        if score_col in top10.columns:
-            top10[score_col] = top10[score_col].apply(
-                lambda x: f"{x:.3f}" if pd.notna(x) else "N/A"
-            )
+        # Partial selection of the 10 highest scores instead of sorting every row; the
+        # table is built as a plain DataFrame so geometry never enters it
+        scores = _score_array(gdf, score_col)
+        top_idx = _top_n_positions(scores, 10)
+        top10 = pd.DataFrame({c: gdf[c].to_numpy()[top_idx] for c in display_cols})
 
         # Rename columns for display
         rename_dict = {
@@ -1237,13 +1579,21 @@ def render_model2_tab() -> None:
             rename_dict[city_name_col] = "Şehir Adı"
 
         top10 = top10.rename(columns=rename_dict)
-        st.dataframe(top10.reset_index(drop=True), use_container_width=True)
+        # Format numeric columns for better readability; the Styler formats at render
+        # time, so the columns stay numeric and sort numerically in the table
+        st.dataframe(
+            top10.reset_index(drop=True).style.format(
+                {"Nüfus": "{:,.0f}", "Su Arzı": "{:.2f}", "Su Stresi Skoru": "{:.3f}"},
+                na_rep="N/A",
+            ),
+            use_container_width=True,
+        )
 
     # ---- Automated Urban Insights panel ----
     st.markdown("---")
     st.subheader("Otomatik Kentsel İçgörüler")
 
-    insights = _compute_urban_insights(gdf, score_col=score_col)
+    insights = _cached_urban_insights(geojson_path_str, mtime, score_col=score_col)
 
     st.markdown(
         f"**Yüksek su stresi altındaki şehirlerin payı (en üst %20):** "
@@ -1260,15 +1610,26 @@ def render_model2_tab() -> None:
 
     pattern_insights = insights.get("pattern_insights") or []
     if pattern_insights:
-        st.markdown("**Risk deseni analizi:**")
-        for line in pattern_insights:
-            st.markdown(f"- {line}")
+        _markdown_list("Risk deseni analizi:", pattern_insights)
 
     recommended_actions = insights.get("recommended_actions") or []
     if recommended_actions:
-        st.markdown("**Önerilen eylemler:**")
-        for action in recommended_actions:
-            st.markdown(f"- {action}")
+        _markdown_list("Önerilen eylemler:", recommended_actions)
+
+
+# Display names and score weights of the Model 3 components (Component Analysis table)
+_COMPONENT_NAMES_TR = {
+    "drought_norm": "Kuraklık",
+    "groundwater_sensitivity_norm": "Yeraltı Suyu Hassasiyeti",
+    "wetland_proximity_risk_norm": "Sulak Alan Yakınlık Riski",
+    "protected_area_importance_norm": "Korunan Alan Önemi",
+}
+_COMP_WEIGHTS = {
+    "drought_norm": "35%",
+    "groundwater_sensitivity_norm": "30%",
+    "wetland_proximity_risk_norm": "20%",
+    "protected_area_importance_norm": "15%",
+}
 
 
 def render_model3_tab() -> None:
@@ -1290,10 +1651,12 @@ def render_model3_tab() -> None:
         help="Pipeline tarafından üretilen `model3_ecosystem_resilience.geojson` dosyasının yolu.",
         key="model3_path",
     )
+    simplify_tol = _simplify_tolerance_input("model3_simplify_tol")
 
     # ---- Load data ----
+    mtime = _file_mtime(geojson_path_str)
     try:
-        gdf = load_model3_results(geojson_path_str)
+        gdf = load_model3_results(geojson_path_str, mtime=mtime)
     except FileNotFoundError as e:
         st.error(str(e))
         st.info("GeoJSON çıktısını oluşturmak için önce Model 3'ü çalıştırın.")
@@ -1316,8 +1679,8 @@ def render_model3_tab() -> None:
 
     with map_col:
         st.subheader("Ekosistem Su Hassasiyeti Haritası")
-        m = make_ecosystem_resilience_map(gdf)
-        st_folium(m, width="100%", height=600)
+        m = _cached_ecosystem_map(geojson_path_str, mtime, simplify_tol)
+        _show_map(m, geojson_path_str, mtime, simplify_tol, height=600)
 
     with table_col:
         st.subheader("En Yüksek Riskli 10 Ekosistem")
@@ -1337,21 +1700,11 @@ def render_model3_tab() -> None:
         if ecosystem_name_col:
             display_cols.insert(0, ecosystem_name_col)
 
-        top10 = gdf[display_cols].copy()
-        top10 = top10.sort_values(score_col, ascending=False).head(10)
-        if "geometry" in top10.columns:
-            top10 = pd.DataFrame(top10.drop(columns="geometry"))
-
-        # Format numeric columns for better readability
-        if score_col in top10.columns:
-            top10[score_col] = top10[score_col].apply(
-                lambda x: f"{x:.3f}" if pd.notna(x) else "N/A"
-            )
-        for col in ["drought_norm", "groundwater_sensitivity_norm"]:
-            if col in top10.columns:
-                top10[col] = top10[col].apply(
-                    lambda x: f"{x:.3f}" if pd.notna(x) else "N/A"
-                )
+        # Partial selection of the 10 highest scores instead of sorting every row; the
+        # table is built as a plain DataFrame so geometry never enters it
+        scores = _score_array(gdf, score_col)
+        top_idx = _top_n_positions(scores, 10)
+        top10 = pd.DataFrame({c: gdf[c].to_numpy()[top_idx] for c in display_cols})
 
         # Rename columns for display
         rename_dict = {
@@ -1364,13 +1717,20 @@ def render_model3_tab() -> None:
             rename_dict[ecosystem_name_col] = "Ecosystem Name"
 
         top10 = top10.rename(columns=rename_dict)
-        st.dataframe(top10.reset_index(drop=True), use_container_width=True)
+        # Format numeric columns for better readability (at render time, see Model 2)
+        st.dataframe(
+            top10.reset_index(drop=True).style.format(
+                {"Sensitivity Score": "{:.3f}", "Drought": "{:.3f}", "Groundwater": "{:.3f}"},
+                na_rep="N/A",
+            ),
+            use_container_width=True,
+        )
 
     # ---- Automated Ecosystem Insights panel ----
     st.markdown("---")
     st.subheader("Automated Ecosystem Insights")
 
-    insights = _compute_ecosystem_insights(gdf, score_col=score_col)
+    insights = _cached_ecosystem_insights(geojson_path_str, mtime, score_col=score_col)
 
     st.markdown(
         f"**Share of ecosystems under high water sensitivity (top 20%):** "
@@ -1387,15 +1747,11 @@ def render_model3_tab() -> None:
 
     pattern_insights = insights.get("pattern_insights") or []
     if pattern_insights:
-        st.markdown("**Spatial and ecological patterns:**")
-        for line in pattern_insights:
-            st.markdown(f"- {line}")
+        _markdown_list("Spatial and ecological patterns:", pattern_insights)
 
     recommended_actions = insights.get("recommended_actions") or []
     if recommended_actions:
-        st.markdown("**Recommended actions:**")
-        for action in recommended_actions:
-            st.markdown(f"- {action}")
+        _markdown_list("Recommended actions:", recommended_actions)
 
     # ---- Component Analysis section ----
     st.markdown("---")
@@ -1409,29 +1765,25 @@ def render_model3_tab() -> None:
     ]
 
     component_data = []
-    component_names_tr = {
-        "drought_norm": "Kuraklık",
-        "groundwater_sensitivity_norm": "Yeraltı Suyu Hassasiyeti",
-        "wetland_proximity_risk_norm": "Sulak Alan Yakınlık Riski",
-        "protected_area_importance_norm": "Korunan Alan Önemi",
-    }
-    
-    for col in component_cols:
-        if col in gdf.columns:
+    present_cols = [col for col in component_cols if col in gdf.columns]
+    if present_cols:
+        # Mean/min/max of every component in one aggregation, not three reductions per column
+        stats = gdf[present_cols].agg(["mean", "min", "max"])
+        for col in present_cols:
             component_data.append({
-                "Bileşen": component_names_tr.get(col, col.replace("_norm", "").replace("_", " ").title()),
-                "Ortalama": gdf[col].mean(),
-                "Min": gdf[col].min(),
-                "Max": gdf[col].max(),
-                "Ağırlık": "35%" if "drought" in col else "30%" if "groundwater" in col else "20%" if "wetland" in col else "15%",
+                "Bileşen": _COMPONENT_NAMES_TR.get(col, col.replace("_norm", "").replace("_", " ").title()),
+                "Ortalama": stats.at["mean", col],
+                "Min": stats.at["min", col],
+                "Max": stats.at["max", col],
+                "Ağırlık": _COMP_WEIGHTS.get(col, ""),
             })
 
     if component_data:
         comp_df = pd.DataFrame(component_data)
-        comp_df["Ortalama"] = comp_df["Ortalama"].apply(lambda x: f"{x:.3f}")
-        comp_df["Min"] = comp_df["Min"].apply(lambda x: f"{x:.3f}")
-        comp_df["Max"] = comp_df["Max"].apply(lambda x: f"{x:.3f}")
-        st.dataframe(comp_df, use_container_width=True)
+        st.dataframe(
+            comp_df.style.format({"Ortalama": "{:.3f}", "Min": "{:.3f}", "Max": "{:.3f}"}),
+            use_container_width=True,
+        )
 
 
 def main() -> None: